@@ -10,49 +10,88 @@ This module performs the following tasks:
 - Fetches and updates exchange rates from an external API.
 - Provides currency conversion functionality.
 - Responds to requests via a ZeroMQ (zmq) IPC socket.
-- Periodically updates exchange rates using the `schedule` library.
+- Periodically updates exchange rates from a background thread.
 
 Key Components:
 - `fetch_exchange_rates(base: str)`
+- `load_rates_cache()`
+- `save_rates_cache()`
 - `calculate_exchange_rate(
-       base_currency: str,
-       src_currency: str,
-       tgt_currency: str,
-       rates: dict[str, float]
+       src_currency: str, tgt_currency: str, rates: dict[str, float]
     )`
 - `update_all_exchange_rates(base: str, rates: dict[str, float])`
-- `schedule_thread()`
+- `refresh_thread()`
+- `encode_conversion(
+       generation: int,
+       source_currency: str,
+       target_currency: str,
+       amount: int | float
+    )`
 - `handle_convert_currency(data: dict)`
 - `handle_get_exchange_rates(data: dict)`
-- `handle_get_supported_currencies()`
-
-The script initializes a ZeroMQ REP socket for IPC communication, starts
-a background thread for scheduling tasks, and continuously processes
-incoming messages until a shutdown signal is received.
+- `handle_get_supported_currencies(data: dict | None)`
+- `log_request_error(error: Exception)`
+- `handle_batch(data: list[dict])`
+- `dispatch_request(request: dict)`
+- `handle_tagged_request(action_code: bytes, payload: bytes)`
+- `handle_request(message: bytes, payload: bytes)`
+- `handle_message(frames: list[bytes])`
+- `serve()`
+- `handle_shutdown_signal(signum: int, frame)`
+
+The script starts a background thread for refreshing exchange rates,
+then serves a ZeroMQ ROUTER socket for IPC communication from an
+`asyncio` event loop until a shutdown signal is received.
 
 Dependencies:
-- `json`: For JSON data handling.
+- `asyncio`: For the event loop serving requests.
+- `array`: For the compact cross-rate matrix.
 - `os`: For environment variable access.
-- `urllib.request`: For making HTTP requests.
+- `signal`: For shutting down cleanly on SIGTERM.
+- `functools`: For caching conversion responses.
+- `urllib3`: For making pooled HTTP requests.
 - `threading`: For concurrent execution of tasks.
-- `time`: For sleep functionality.
-- `schedule`: For scheduling periodic tasks.
+- `time`: For timing cached API responses.
+- `traceback`: For logging failed requests.
 - `zmq`: For ZeroMQ socket communication.
+- `orjson`: For fast JSON encoding and decoding.
+- `msgpack`: For the optional MessagePack wire format.
 - `dotenv`: For loading environment variables from a .env file.
+- `uvloop`: Optional, for a faster event loop.
 """
 
-import json
+import asyncio
 import os
-import urllib.request
-from threading import Event, Lock, Thread
-from time import sleep
-
-import schedule
+import signal
+import traceback
+from array import array
+from functools import lru_cache
+from threading import Event, Thread
+from time import monotonic
+
+import msgpack
+import orjson
+import urllib3
 import zmq
+import zmq.asyncio
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 load_dotenv()
 
+# Encoding of requests and responses, JSON unless MessagePack is configured
+WIRE_FORMAT = os.getenv("WIRE_FORMAT", "json")
+if WIRE_FORMAT == "json":
+    encode_message, decode_message = orjson.dumps, orjson.loads
+elif WIRE_FORMAT == "msgpack":
+    encode_message, decode_message = msgpack.packb, msgpack.unpackb
+else:
+    raise EnvironmentError(f"Unsupported WIRE_FORMAT: {WIRE_FORMAT}")
+
 SUPPORTED_CURRENCIES = {
     "USD": "United States Dollar",
     "EUR": "Euro",
@@ -60,6 +99,27 @@ SUPPORTED_CURRENCIES = {
     "GBP": "British Pound",
 }
 
+# Responses for `get_supported_currencies`, which never change
+SORTED_CURRENCIES = dict(sorted(SUPPORTED_CURRENCIES.items()))
+SUPPORTED_CURRENCIES_RESPONSE = encode_message(SORTED_CURRENCIES)
+
+# Encoded error responses, built once instead of on every failed request
+INVALID_AMOUNT_ERROR = encode_message({"error": "Amount must be a number"})
+INVALID_CURRENCY_ERROR = encode_message({"error": "Invalid currency code"})
+RATES_UNAVAILABLE_ERROR = encode_message({"error": "Exchange rate not available"})
+INVALID_BATCH_ERROR = encode_message({"error": "Batch data must be a list"})
+UNKNOWN_ACTION_ERROR = encode_message({"error": "Unknown action"})
+
+# Row/column index of each currency in the cross-rate matrix
+CURRENCY_IDX = {code: idx for idx, code in enumerate(SUPPORTED_CURRENCIES)}
+# Offset into the cross-rate matrix of each valid (source, target) pair
+CURRENCY_PAIR_IDX = {
+    (src, tgt): src_idx * len(CURRENCY_IDX) + tgt_idx
+    for src, src_idx in CURRENCY_IDX.items()
+    for tgt, tgt_idx in CURRENCY_IDX.items()
+    if src != tgt
+}
+
 # FXRatesAPI configuration
 FXRATES_API_URL = "https://api.fxratesapi.com/latest"
 # Enter your own API key here
@@ -68,43 +128,176 @@ FXRATES_API_KEY = os.getenv("FXRATES_TOKEN")
 if not FXRATES_API_KEY:
     raise EnvironmentError("FXRATES_TOKEN is not set in the environment variables")
 
-exchange_rates = {}
-exchange_rates_lock = Lock()
+# Request URL for each base currency, built once since the inputs never change
+FXRATES_URLS = {
+    base: (
+        f"{FXRATES_API_URL}?api_key={FXRATES_API_KEY}"
+        f"&currencies={','.join(c for c in SUPPORTED_CURRENCIES if c != base)}"
+        f"&base={base}"
+    )
+    for base in SUPPORTED_CURRENCIES
+}
+
+# Store the cross-rate matrix as float32 instead of float64, halving its
+# size at the cost of precision beyond about 7 significant digits
+COMPACT_RATES = os.getenv("COMPACT_RATES", "").lower() in ("1", "true")
+RATES_TYPECODE = "f" if COMPACT_RATES else "d"
+
+# Keep-alive connection pool reused across FXRatesAPI requests, retrying
+# transient failures with a short backoff
+http = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=len(SUPPORTED_CURRENCIES),
+    headers={"Accept": "application/json"},
+    timeout=10,
+    retries=urllib3.Retry(
+        total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504)
+    ),
+)
+
+# Rate tables below are replaced as a whole by `update_all_exchange_rates`
+# and never mutated in place, so readers need no lock
+# Row-major NxN matrix, rates_matrix[i * N + j] is rate(i -> j)
+rates_matrix = array(RATES_TYPECODE)
+# Encoded `get_exchange_rates` response for each currency
+rates_responses = {}
+# Bumped after each publish, so cached conversions of older rates are
+# never looked up again
+rates_generation = 0
 shutdown_event = Event()
 
+# How many serialized conversion responses are kept
+CONVERSION_CACHE_SIZE = 4096
+
+# How long a fetched API response is reused before the API is called again
+FETCH_CACHE_TTL_SECONDS = 30
+# Last successful API response for each base, as (fetch time, rates)
+fetch_cache: dict[str, tuple[float, dict[str, float]]] = {}
+
+# How often exchange rates are refreshed, hourly unless configured. Shorter
+# than the fetch TTL would only wake the refresher to skip the fetch
+REFRESH_INTERVAL_SECONDS = os.getenv("REFRESH_INTERVAL_SECONDS", str(60 * 60))
+if not REFRESH_INTERVAL_SECONDS.isdigit() or (
+    int(REFRESH_INTERVAL_SECONDS) < FETCH_CACHE_TTL_SECONDS
+):
+    raise EnvironmentError(
+        f"REFRESH_INTERVAL_SECONDS must be a whole number of seconds, at least "
+        f"{FETCH_CACHE_TTL_SECONDS}: {REFRESH_INTERVAL_SECONDS}"
+    )
+REFRESH_INTERVAL_SECONDS = int(REFRESH_INTERVAL_SECONDS)
+
+# Response headers that identify a version of the API response, and the
+# request headers that send them back so an unchanged one returns a 304
+VALIDATOR_HEADERS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+# Request headers revalidating the last API response for each base
+fetch_validators: dict[str, dict[str, str]] = {}
+
+# File the last API responses are saved to, so a restarted service can
+# revalidate them instead of fetching them again
+RATES_CACHE_FILE = os.getenv("RATES_CACHE_FILE")
+
+# Address clients connect to
+SERVICE_ADDR = "ipc:///tmp/currency_converter"
+# Messages each socket queues before blocking or dropping, raised from
+# ZeroMQ's default of 1000 so bursts of small requests are not throttled
+SOCKET_HWM = 10000
+
 
 def fetch_exchange_rates(base: str = "USD"):
     """Fetch exchange rates from the FXRatesAPI for a given base
     currency and update all exchange rates.
 
+    Repeated calls within `FETCH_CACHE_TTL_SECONDS` of a successful
+    fetch are skipped, since the published rates are already current.
+    Later calls revalidate the last response, and leave the published
+    rates as they are if the API reports them unchanged.
+
     :param base: base currency code, default is 'USD'
     """
-    currencies = ",".join(filter(lambda x: x != base, SUPPORTED_CURRENCIES.keys()))
+    cached = fetch_cache.get(base)
+    if cached is not None and monotonic() - cached[0] < FETCH_CACHE_TTL_SECONDS:
+        return
+
     try:
-        url = f"{FXRATES_API_URL}?api_key={FXRATES_API_KEY}&currencies={currencies}&base={base}"
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
-            base_currency = data.get("base")
-            rates = data.get("rates")
-            update_all_exchange_rates(base_currency, rates)
+        response = http.request(
+            "GET",
+            FXRATES_URLS[base],
+            headers={**http.headers, **fetch_validators.get(base, {})},
+        )
+        if response.status == 304:
+            # Validators are only sent for cached rates, which are still current
+            fetch_cache[base] = (monotonic(), cached[1])
+            return
+        if response.status != 200:
+            raise urllib3.exceptions.HTTPError(f"HTTP {response.status}")
+        data = orjson.loads(response.data)
+        base_currency = data.get("base")
+        rates = data.get("rates")
+        update_all_exchange_rates(base_currency, rates)
+        if rates is not None:
+            fetch_cache[base] = (monotonic(), rates)
+            fetch_validators[base] = {
+                request_header: response.headers[response_header]
+                for response_header, request_header in VALIDATOR_HEADERS.items()
+                if response_header in response.headers
+            }
+            save_rates_cache()
     except Exception as error:
         print(f"Failed to fetch exchange rates for {base}: {error}")
 
 
+def load_rates_cache() -> None:
+    """Publish the exchange rates saved in `RATES_CACHE_FILE` by a
+    previous run, if it is set and exists.
+
+    The loaded responses are treated as expired, so the next fetch
+    revalidates them with the API instead of skipping it.
+    """
+    if not RATES_CACHE_FILE:
+        return
+
+    try:
+        with open(RATES_CACHE_FILE, "rb") as file:
+            saved = orjson.loads(file.read())
+        for base, entry in saved.items():
+            update_all_exchange_rates(base, entry["rates"])
+            fetch_cache[base] = (monotonic() - FETCH_CACHE_TTL_SECONDS, entry["rates"])
+            fetch_validators[base] = entry["validators"]
+    except FileNotFoundError:
+        pass
+    except Exception as error:
+        print(f"Failed to load cached exchange rates: {error}")
+
+
+def save_rates_cache() -> None:
+    """Save the last API response for each base to `RATES_CACHE_FILE`,
+    if it is set."""
+    if not RATES_CACHE_FILE:
+        return
+
+    saved = {
+        base: {"rates": rates, "validators": fetch_validators.get(base, {})}
+        for base, (_, rates) in fetch_cache.items()
+    }
+    try:
+        # Replace the file in one step, so a crash never leaves it partial
+        with open(f"{RATES_CACHE_FILE}.tmp", "wb") as file:
+            file.write(orjson.dumps(saved))
+        os.replace(f"{RATES_CACHE_FILE}.tmp", RATES_CACHE_FILE)
+    except OSError as error:
+        print(f"Failed to save cached exchange rates: {error}")
+
+
 def calculate_exchange_rate(
-    base_currency: str, src_currency: str, tgt_currency: str, rates: dict[str, float]
+    src_currency: str, tgt_currency: str, rates: dict[str, float]
 ) -> float:
-    """Calculates the exchange rate from one currency to another.
+    """Calculates the cross rate from one currency to another.
 
-    :param base_currency: the base currency code
     :param src_currency: the source currency code
     :param tgt_currency: the target currency code
-    :param rates: dictionary containing the exchange rates for the base
+    :param rates: dictionary containing the exchange rates for a single
+                  base, including the base itself at 1.0
     """
-    if src_currency == base_currency:
-        return rates[tgt_currency]
-    if tgt_currency == base_currency:
-        return 1 / rates[src_currency]
     return rates[tgt_currency] / rates[src_currency]
 
 
@@ -112,134 +305,317 @@ def update_all_exchange_rates(base: str, rates: dict[str, float]) -> None:
     """Calculates and updates the exchange rates between all of the
     supported currencies.
 
+    All cross rates are derived from the rates of a single base, so one
+    API request is enough to fill the whole table. The new table is
+    built off to the side, together with its encoded form, and
+    published by rebinding `rates_matrix` and `rates_responses`, so
+    readers never see a partial update.
+
     :param base: base currency code
     :param rates: dictionary containing the exchange rates for the base
     """
+    global rates_matrix, rates_responses, rates_generation
+
     if None in (base, rates):
         print("Failed to update exchange rates.")
         return
 
+    rates = {**rates, base: 1.0}
     currencies = SUPPORTED_CURRENCIES.keys()
-    with exchange_rates_lock:
-        for src_currency in currencies:
-            exchange_rates[src_currency] = {}
-            for tgt_currency in currencies:
-                if src_currency != tgt_currency:
-                    rate = calculate_exchange_rate(
-                        base, src_currency, tgt_currency, rates
-                    )
-                    exchange_rates[src_currency][tgt_currency] = rate
+    # Each cross rate is calculated once, in the matrix's row-major order
+    cross_rates = [
+        calculate_exchange_rate(src_currency, tgt_currency, rates)
+        for src_currency in currencies
+        for tgt_currency in currencies
+    ]
+    new_matrix = array(RATES_TYPECODE, cross_rates)
+
+    # Read back from the matrix, so with COMPACT_RATES the published rates
+    # are the same float32 values that conversions use
+    new_rates = {currency: {} for currency in currencies}
+    for (src_currency, tgt_currency), pair_idx in CURRENCY_PAIR_IDX.items():
+        new_rates[src_currency][tgt_currency] = new_matrix[pair_idx]
+
+    new_rates_responses = {
+        currency: encode_message(currency_rates)
+        for currency, currency_rates in new_rates.items()
+    }
 
+    rates_matrix = new_matrix
+    rates_responses = new_rates_responses
+    # Only bumped once the new matrix is visible, so no conversion of the
+    # old rates is ever cached under the new generation
+    rates_generation += 1
     print("Exchange rates updated.")
 
 
-def schedule_thread():
-    """Run a thread that periodically runs scheduled tasks."""
-    while not shutdown_event.is_set():
-        schedule.run_pending()
-        sleep(1)
+def refresh_thread():
+    """Run a thread that refreshes the exchange rates every
+    `REFRESH_INTERVAL_SECONDS` until shutdown is requested."""
+    while not shutdown_event.wait(REFRESH_INTERVAL_SECONDS):
+        fetch_exchange_rates()
+
 
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE, typed=True)
+def encode_conversion(
+    generation: int, source_currency: str, target_currency: str, amount: int | float
+) -> bytes:
+    """Convert an amount using the current cross-rate matrix and encode
+    the response, memoized so repeated conversions skip both steps.
 
-def handle_convert_currency(data: dict) -> dict:
+    :param generation: the `rates_generation` read before the call, which
+                       keys the cache to the rates it was computed from
+    :param source_currency: a valid source currency code
+    :param target_currency: a valid target currency code, different
+                            from the source
+    :param amount: the amount to convert
+    :returns: the encoded conversion response
+    """
+    pair_idx = CURRENCY_PAIR_IDX[(source_currency, target_currency)]
+    return encode_message(
+        {
+            "source_currency": source_currency,
+            "target_currency": target_currency,
+            "amount": amount,
+            "converted_amount": amount * rates_matrix[pair_idx],
+        }
+    )
+
+
+def handle_convert_currency(data: dict) -> bytes:
     """Convert an amount from one currency to another using the current
     exchange rates.
 
     :param data: a dictionary containing 'source_currency',
                 'target_currency', and 'amount'
-    :returns: a dictionary containing the source and target currency
-              codes, original amount, and converted amount, or an error
-              message if conversion fails
+    :returns: the encoded source and target currency codes, original
+              amount, and converted amount, or an error message if
+              conversion fails
     """
     source_currency = data.get("source_currency")
     target_currency = data.get("target_currency")
     amount = data.get("amount")
 
     if not isinstance(amount, (int, float)):
-        return {"error": "Amount must be a number"}
-
-    with exchange_rates_lock:
-        if (
-            source_currency not in exchange_rates
-            or target_currency not in exchange_rates[source_currency]
-        ):
-            return {"error": "Invalid currency code"}
-
-        exchange_rate = exchange_rates[source_currency].get(target_currency)
-        if exchange_rate is None:
-            return {"error": "Exchange rate not available"}
-
-        converted_amount = amount * exchange_rate
-
-    return {
-        "source_currency": source_currency,
-        "target_currency": target_currency,
-        "amount": amount,
-        "converted_amount": converted_amount,
-    }
+        return INVALID_AMOUNT_ERROR
+
+    if (source_currency, target_currency) not in CURRENCY_PAIR_IDX:
+        return INVALID_CURRENCY_ERROR
+
+    if not rates_generation:
+        return RATES_UNAVAILABLE_ERROR
 
+    return encode_conversion(rates_generation, source_currency, target_currency, amount)
 
-def handle_get_exchange_rates(data: dict) -> dict:
+
+def handle_get_exchange_rates(data: dict) -> bytes:
     """Retrieve exchange rates for a specified currency code.
 
     :param data: a dictionary containing 'currency_code'
-    :returns: a dictionary of exchange rates for the specified currency
+    :returns: the encoded exchange rates for the specified currency
               or an error message if the code is invalid
     """
     currency_code = data.get("currency_code")
 
-    if currency_code not in exchange_rates:
-        return {"error": "Invalid currency code"}
+    response = rates_responses.get(currency_code)
+    if response is None:
+        return INVALID_CURRENCY_ERROR
 
-    return exchange_rates[currency_code]
+    return response
 
 
-def handle_get_supported_currencies() -> dict[str, str]:
+def handle_get_supported_currencies(data: dict | None = None) -> bytes:
     """Retrieve a sorted list of supported currency codes and their
     corresponding names.
 
-    :returns: a dictionary of supported currency codes and their
-              corresponding names
+    :param data: unused, accepted so all handlers share one signature
+    :returns: the encoded dictionary of supported currency codes and
+              their corresponding names
     """
-    sorted_currencies = dict(sorted(SUPPORTED_CURRENCIES.items()))
-    return sorted_currencies
+    return SUPPORTED_CURRENCIES_RESPONSE
 
 
-try:
-    # Define server socket  using IPC
-    context = zmq.Context()
-    socket = context.socket(zmq.REP)
-    socket.bind("ipc:///tmp/currency_converter")
+def log_request_error(error: Exception) -> None:
+    """Log a request that failed with an exception, with its traceback,
+    since the client only gets the error message.
 
-    # Populate exchange rates upon starting the service
-    fetch_exchange_rates()
+    :param error: the exception raised handling the request
+    """
+    print(f"Error: {error}\n{traceback.format_exc()}", end="")
 
-    # Schedule exchange rate updates every hour
-    schedule.every().hour.do(fetch_exchange_rates)
 
-    # Start the schedule thread
-    scheduler_thread = Thread(target=schedule_thread, daemon=True)
-    scheduler_thread.start()
+def handle_batch(data: list[dict]) -> bytes:
+    """Handle several requests sent in a single message.
 
-    while not shutdown_event.is_set():
+    :param data: a list of requests, each containing 'action' and 'data'
+    :returns: the encoded 'results' list holding the response to
+              each request in order, or an error message if the batch
+              is malformed
+    """
+    if not isinstance(data, list):
+        return INVALID_BATCH_ERROR
+
+    results = []
+    for request in data:
         try:
-            message = socket.recv_json(flags=zmq.NOBLOCK)
-            action = message.get("action")
-            data = message.get("data")
-            if action == "convert_currency":
-                response = handle_convert_currency(data)
-            elif action == "get_exchange_rates":
-                response = handle_get_exchange_rates(data)
-            elif action == "get_supported_currencies":
-                response = handle_get_supported_currencies()
-            else:
-                response = {"error": "Unknown action"}
-
-            socket.send_json(response)
-        except zmq.Again:
-            sleep(1)  # No message received, sleep briefly
+            response = dispatch_request(request)
         except Exception as e:
-            print(f"Error: {e}")
-            socket.send_json({"error": str(e)})
+            log_request_error(e)
+            response = {"error": str(e)}
+        results.append(encode_response(response))
+
+    # Splice the already encoded results into the enclosing message
+    if WIRE_FORMAT == "msgpack":
+        packer = msgpack.Packer()
+        return (
+            packer.pack_map_header(1)
+            + packer.pack("results")
+            + packer.pack_array_header(len(results))
+            + b"".join(results)
+        )
+    return b'{"results":[' + b",".join(results) + b"]}"
+
+
+# One-byte action codes for requests sent as tagged binary frames
+CONVERT_CURRENCY_CODE = b"\x00"
+GET_EXCHANGE_RATES_CODE = b"\x01"
+GET_SUPPORTED_CURRENCIES_CODE = b"\x02"
+
+# Request handler for each supported action
+HANDLERS = {
+    "convert_currency": handle_convert_currency,
+    "get_exchange_rates": handle_get_exchange_rates,
+    "get_supported_currencies": handle_get_supported_currencies,
+    "batch": handle_batch,
+}
+
+
+def dispatch_request(request: dict) -> bytes:
+    """Dispatch a decoded request to the handler for its action.
+
+    :param request: a dictionary containing 'action' and 'data'
+    :returns: the response from the handler or an error message
+    """
+    handler = HANDLERS.get(request.get("action"))
+    if handler is None:
+        return UNKNOWN_ACTION_ERROR
+    return handler(request.get("data"))
+
+
+def encode_response(response: bytes | dict) -> bytes:
+    """Encode a handler response, passing pre-encoded responses through.
+
+    :param response: the response from a handler
+    :returns: the encoded response
+    """
+    if isinstance(response, bytes):
+        return response
+    return encode_message(response)
+
+
+def handle_tagged_request(action_code: bytes, payload: bytes) -> bytes:
+    """Handle a request sent as a one-byte action code followed by an
+    optional payload frame, skipping decoding where possible.
+
+    :param action_code: one of the `*_CODE` action codes
+    :param payload: the currency code for `GET_EXCHANGE_RATES_CODE`, or
+                    the encoded data for `CONVERT_CURRENCY_CODE`
+    :returns: the response for the action or an error message
+    """
+    if action_code == GET_SUPPORTED_CURRENCIES_CODE:
+        return SUPPORTED_CURRENCIES_RESPONSE
+    if action_code == GET_EXCHANGE_RATES_CODE:
+        return handle_get_exchange_rates({"currency_code": payload.decode()})
+    if action_code == CONVERT_CURRENCY_CODE:
+        return handle_convert_currency(decode_message(payload))
+    return UNKNOWN_ACTION_ERROR
+
+
+def handle_request(message: bytes = b"", payload: bytes = b"") -> bytes:
+    """Decode a request, dispatch it to the handler for its action and
+    encode the response.
+
+    :param message: the encoded request, or a one-byte action code
+    :param payload: the payload frame following an action code
+    :returns: the encoded response
+    """
+    try:
+        if len(message) == 1:
+            response = handle_tagged_request(message, payload)
+        else:
+            response = dispatch_request(decode_message(message))
+    except Exception as e:
+        log_request_error(e)
+        response = {"error": str(e)}
+
+    return encode_response(response)
+
+
+def handle_message(frames: list[bytes]) -> list[bytes] | None:
+    """Build the reply to a message received on the service socket.
+
+    :param frames: the message frames, starting with the routing
+                   envelope added by the ROUTER socket and the client
+    :returns: the reply frames, or None if the message has no envelope
+              delimiter and cannot be replied to
+    """
+    # Frames up to the empty delimiter route the reply to the client
+    try:
+        delimiter = frames.index(b"")
+    except ValueError:
+        print("Error: dropped message without an envelope delimiter")
+        return None
+    envelope, body = frames[: delimiter + 1], frames[delimiter + 1 :]
+    return [*envelope, handle_request(*body[:2])]
+
+
+async def serve():
+    """Receive requests on the service socket and reply to them until
+    cancelled."""
+    socket = context.socket(zmq.ROUTER)
+    try:
+        socket.bind(SERVICE_ADDR)
+        while True:
+            reply = handle_message(await socket.recv_multipart())
+            if reply is not None:
+                # Responses are mostly cached bytes, hand them over without
+                # a copy
+                await socket.send_multipart(reply, copy=False)
+    finally:
+        socket.close(linger=0)
+
+
+def handle_shutdown_signal(signum: int, frame) -> None:
+    """Stop the service when it receives SIGTERM.
+
+    :param signum: the received signal number
+    :param frame: the interrupted stack frame
+    """
+    print(f"\n{signal.Signals(signum).name} received, shutting down...")
+    # A repeated signal must not interrupt the cleanup that follows
+    signal.signal(signum, signal.SIG_IGN)
+    raise SystemExit(0)
+
+
+context = zmq.asyncio.Context()
+context.setsockopt(zmq.SNDHWM, SOCKET_HWM)
+context.setsockopt(zmq.RCVHWM, SOCKET_HWM)
+refresher_thread = Thread(target=refresh_thread, daemon=True)
+signal.signal(signal.SIGTERM, handle_shutdown_signal)
+
+try:
+    # Populate exchange rates upon starting the service, revalidating
+    # the ones saved by the last run if there are any
+    load_rates_cache()
+    fetch_exchange_rates()
+
+    # Start the thread that refreshes exchange rates every hour
+    refresher_thread.start()
+
+    # Serve requests from an event loop, uvloop's if it is installed
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(serve())
 
 except KeyboardInterrupt:
     print("\nKeyboard interrupt received, shutting down...")
@@ -248,9 +624,10 @@ except Exception as e:
 finally:
     print("Cleaning up resources...")
     shutdown_event.set()
-    # Wait for the scheduler thread to finish
-    scheduler_thread.join()
-    socket.setsockopt(zmq.LINGER, 0)
-    socket.close()
+    # A refresh can be stuck retrying the API for tens of seconds, don't
+    # wait for it; the thread is a daemon and dies with the process
+    if refresher_thread.is_alive():
+        refresher_thread.join(timeout=1)
     context.term()
+    http.clear()
     print("Service stopped.")
@@ -1,8 +1,70 @@
+import atexit
+import os
+from concurrent.futures import Future
+from threading import Condition, Thread, local
+from time import monotonic
+
+import msgpack
+import orjson
 import zmq
 
 CURRENCY_SERVICE_ADDR = "ipc:///tmp/currency_converter"
 
-context = zmq.Context()
+# Must match the WIRE_FORMAT the service was started with
+if os.getenv("WIRE_FORMAT", "json") == "msgpack":
+    encode_message, decode_message = msgpack.packb, msgpack.unpackb
+else:
+    encode_message, decode_message = orjson.dumps, orjson.loads
+
+# Raised encoding a request that does not fit the wire format, such as an
+# integer beyond 64 bits
+ENCODE_ERRORS = (TypeError, OverflowError)
+
+context = zmq.Context.instance()
+
+# ZeroMQ sockets are not thread-safe, so each thread keeps its own
+# socket per service address and socket type
+thread_local = local()
+
+
+def get_socket(service_address: str, socket_type: int = zmq.REQ) -> zmq.Socket:
+    """Return this thread's socket for a service, connecting it on first
+    use.
+
+    :param service_address: the address of the service
+    :param socket_type: the ZeroMQ socket type, default is REQ
+    :returns: a connected socket
+    """
+    sockets = thread_local.__dict__.setdefault("sockets", {})
+    socket = sockets.get((service_address, socket_type))
+    if socket is None:
+        socket = context.socket(socket_type)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(service_address)
+        sockets[(service_address, socket_type)] = socket
+    return socket
+
+
+def close_socket(service_address: str, socket_type: int = zmq.REQ) -> None:
+    """Close and forget this thread's socket for a service, so the next
+    request reconnects.
+
+    :param service_address: the address of the service
+    :param socket_type: the ZeroMQ socket type, default is REQ
+    """
+    socket = thread_local.sockets.pop((service_address, socket_type))
+    socket.close()
+
+
+def close_sockets() -> None:
+    """Close and forget all of this thread's sockets."""
+    for socket in thread_local.__dict__.pop("sockets", {}).values():
+        socket.close()
+
+
+# A socket may only be closed by the thread using it, so at exit only the
+# main thread's are closed here; other threads close their own
+atexit.register(close_sockets)
 
 
 def send_request(service_address: str, request: dict) -> dict:
@@ -12,15 +74,62 @@ def send_request(service_address: str, request: dict) -> dict:
     :request: the request payload to send
     :returns: the response from the service or an error message
     """
-    with context.socket(zmq.REQ) as socket:
-        try:
-            socket.connect(service_address)
-            socket.send_json(request)
-            response = socket.recv_json()
-            return response
-        except zmq.ZMQError as error:
-            print(f"Error connecting to the service: {error}")
-            return {"error": "Service not available"}
+    try:
+        message = encode_message(request)
+    except ENCODE_ERRORS as error:
+        return {"error": f"Request cannot be encoded: {error}"}
+
+    socket = get_socket(service_address)
+    try:
+        socket.send(message)
+        response = decode_message(socket.recv())
+        return response
+    except zmq.ZMQError as error:
+        # A failed REQ socket is stuck mid-exchange, replace it next time
+        close_socket(service_address)
+        print(f"Error connecting to the service: {error}")
+        return {"error": "Service not available"}
+
+
+def send_requests(service_address: str, requests: list[dict]) -> list[dict]:
+    """Send several requests to the service without waiting for each
+    response in turn, and return the responses in request order.
+
+    :param service_address: the address of the service
+    :param requests: the request payloads to send
+    :returns: the responses from the service or error messages
+    """
+    responses = [None] * len(requests)
+    sent = 0
+    socket = get_socket(service_address, zmq.DEALER)
+    try:
+        # The service echoes the frames before the empty delimiter, which
+        # lets replies be matched to requests whatever order they arrive in
+        for request_id, request in enumerate(requests):
+            try:
+                message = encode_message(request)
+            except ENCODE_ERRORS as error:
+                responses[request_id] = {"error": f"Request cannot be encoded: {error}"}
+                continue
+            socket.send_multipart([request_id.to_bytes(4, "big"), b"", message])
+            sent += 1
+        for _ in range(sent):
+            request_id, _, response = socket.recv_multipart()
+            responses[int.from_bytes(request_id, "big")] = decode_message(response)
+        return responses
+    except zmq.ZMQError as error:
+        close_socket(service_address, zmq.DEALER)
+        print(f"Error connecting to the service: {error}")
+        # Keep the errors of requests that could not be encoded
+        return [
+            {"error": "Service not available"} if response is None else response
+            for response in responses
+        ]
+    except Exception:
+        # Replies still queued on the socket would be taken for the next
+        # call's, as request IDs restart at 0
+        close_socket(service_address, zmq.DEALER)
+        raise
 
 
 def convert_currency(
@@ -66,8 +175,128 @@ def get_supported_currencies() -> dict[str, str]:
     return response
 
 
+class Batcher:
+    """Queue requests and send them to the service as batches.
+
+    A batch is sent once `max_size` requests are queued or `max_wait_ms`
+    after the first request of the batch was queued, whichever comes
+    first. Each request returns a future resolved with its response.
+    """
+
+    def __init__(
+        self,
+        service_address: str = CURRENCY_SERVICE_ADDR,
+        max_size: int = 32,
+        max_wait_ms: float = 5,
+    ):
+        """Start the thread that sends the batches.
+
+        :param service_address: the address of the service
+        :param max_size: the most requests to send in one batch
+        :param max_wait_ms: the longest a request waits for its batch
+        """
+        self.service_address = service_address
+        self.max_size = max_size
+        self.max_wait_ms = max_wait_ms
+        # Queued requests with their futures and the time they were queued
+        self.pending: list[tuple[dict, Future, float]] = []
+        self.condition = Condition()
+        self.closed = False
+        self.thread = Thread(target=self._send_batches, daemon=True)
+        self.thread.start()
+
+    def submit(self, request: dict) -> Future:
+        """Queue a request for the next batch.
+
+        :param request: the request payload to send
+        :returns: a future resolved with the response or an error message,
+                  or failed with the exception raised sending its batch
+        """
+        future = Future()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Cannot submit to a closed Batcher")
+            self.pending.append((request, future, monotonic()))
+            self.condition.notify()
+        return future
+
+    def convert(self, src_currency: str, tgt_currency: str, amt: float | int) -> Future:
+        """Queue a conversion of an amount from one currency to another.
+
+        :param src_currency: the source currency code
+        :param tgt_currency: the target currency code
+        :param amt: the amount to convert
+        :returns: a future resolved with the conversion result or an
+                  error message
+        """
+        return self.submit(
+            {
+                "action": "convert_currency",
+                "data": {
+                    "source_currency": src_currency,
+                    "target_currency": tgt_currency,
+                    "amount": amt,
+                },
+            }
+        )
+
+    def close(self):
+        """Send any queued requests, then stop the thread sending the
+        batches and close its socket."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+    def _send_batches(self):
+        """Wait for queued requests and send them in batches until
+        closed."""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    break
+                deadline = self.pending[0][2] + self.max_wait_ms / 1000
+                while len(self.pending) < self.max_size and not self.closed:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                batch = self.pending[: self.max_size]
+                self.pending = self.pending[self.max_size :]
+
+            request = {"action": "batch", "data": [request for request, *_ in batch]}
+            try:
+                response = send_request(self.service_address, request)
+                results = response.get("results", [response] * len(batch))
+            except Exception as error:
+                # Fail this batch's futures, and keep serving later batches
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+        # This thread's socket can only be closed from this thread
+        close_sockets()
+
+
 # Example usage
 if __name__ == "__main__":
     print(convert_currency("USD", "EUR", 100.00))
     print(get_exchange_rates("USD"))
     print(get_supported_currencies())
+    print(
+        send_requests(
+            CURRENCY_SERVICE_ADDR,
+            [
+                {"action": "get_exchange_rates", "data": {"currency_code": code}}
+                for code in ("USD", "EUR", "JPY", "GBP")
+            ],
+        )
+    )
+    batcher = Batcher()
+    futures = [batcher.convert("USD", code, 100.00) for code in ("EUR", "JPY", "GBP")]
+    print([future.result() for future in futures])
+    batcher.close()